@@ -0,0 +1,76 @@
+import json
+import os
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.utils import parse_compare_fail
+
+from tests.conftest import chromium, firefox, replay  # noqa: F401
+
+BASELINE = Path(__file__).resolve().parent / "baselines" / "memory.json"
+# Caches warmed by the tests run before, like the spacy strings, move small
+# peaks by some kilobytes, which is not a regression
+SLACK = 64 * 1024
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    """Compare the times with the last run saved by --benchmark-autosave,
+    failing when slower than BENCHMARK_TIME_THRESHOLD, "min:10%" by
+    default. Nothing is compared while recording, when benchmarking is
+    disabled, when comparison options were given or with no saved run"""
+    option, session = config.option, config._benchmarksession
+    if (
+        option.benchmark_autosave
+        or option.benchmark_save
+        or option.benchmark_disable
+        or option.benchmark_compare
+        or option.benchmark_compare_fail
+    ):
+        return
+    session.compare = True
+    session.handle_loading()
+    if session.compared_mapping:
+        threshold = os.environ.get("BENCHMARK_TIME_THRESHOLD", "min:10%")
+        session.compare_fail = [parse_compare_fail(threshold)]
+
+
+@pytest.fixture
+def peak_memory(request, benchmark):
+    """Measure the peak memory of a call, out of the timed rounds. With
+    --benchmark-autosave the peak is saved as baseline, otherwise it fails
+    when above the baseline by more than BENCHMARK_MEMORY_THRESHOLD. The
+    baselines are kept by test and by the spacy model in extra_info, when
+    used, since the blank pipeline uses far less memory than a trained
+    one"""
+
+    def measure(function, *args):
+        tracemalloc.start()
+        try:
+            function(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["peak_memory_bytes"] = peak
+        name = request.node.nodeid
+        if "model" in benchmark.extra_info:
+            name = f"{name}[{benchmark.extra_info['model']}]"
+        baselines = (
+            json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+        )
+        if request.config.getoption("benchmark_autosave"):
+            baselines[name] = peak
+            BASELINE.parent.mkdir(exist_ok=True)
+            BASELINE.write_text(
+                json.dumps(baselines, indent=2, sort_keys=True) + "\n"
+            )
+        elif name in baselines:
+            threshold = float(
+                os.environ.get("BENCHMARK_MEMORY_THRESHOLD", 0.1)
+            )
+            limit = baselines[name] * (1 + threshold) + SLACK
+            assert peak <= limit, f"Peak memory {peak} above {limit:.0f}"
+        return peak
+
+    return measure
@@ -0,0 +1,94 @@
+import random
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List
+
+WORDS = [
+    "annual",
+    "report",
+    "budget",
+    "invoice",
+    "meeting",
+    "notes",
+    "draft",
+    "final",
+    "project",
+    "plan",
+    "roadmap",
+    "summary",
+    "contract",
+    "proposal",
+    "presentation",
+    "design",
+    "review",
+    "quarterly",
+    "sales",
+    "marketing",
+    "team",
+    "client",
+    "backup",
+    "photo",
+    "scan",
+    "resume",
+    "thinking",
+    "out",
+    "the",
+    "box",
+    "old",
+    "new",
+    "copy",
+    "v2",
+    "2023",
+    "Q1",
+    "Q4",
+]
+MIME_TYPES = [
+    ("application/vnd.google-apps.folder", ""),
+    ("application/vnd.google-apps.document", ""),
+    ("application/vnd.google-apps.spreadsheet", ""),
+    ("application/pdf", ".pdf"),
+    ("image/jpeg", ".jpg"),
+    ("image/png", ".png"),
+    ("text/plain", ".txt"),
+    ("text/csv", ".csv"),
+    ("application/zip", ".zip"),
+    ("video/mp4", ".mp4"),
+]
+MIME_WEIGHTS = [15, 20, 10, 15, 15, 5, 5, 5, 5, 5]
+SEPARATORS = ["_", "-", " ", ""]
+
+
+def file_name(generator: random.Random, extension: str) -> str:
+    """Build a file name like the ones people give, mixing separators and
+    camel case"""
+    words = generator.sample(WORDS, generator.randint(1, 5))
+    separator = generator.choice(SEPARATORS)
+    if not separator:
+        words = [word.capitalize() for word in words]
+    return separator.join(words) + extension
+
+
+@lru_cache(maxsize=None)
+def drive_listing(files: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Build a synthetic Google Drive listing, with the same fields asked
+    by GoogleDriveAPI.list_fields"""
+    generator = random.Random(seed)
+    start = datetime(2015, 1, 1)
+    folders = [f"folder{index}" for index in range(max(files // 50, 1))]
+    items = []
+    for index in range(files):
+        mime_type, extension = generator.choices(MIME_TYPES, MIME_WEIGHTS)[0]
+        item = {
+            "id": f"{index:x}".rjust(33, "0"),
+            "name": file_name(generator, extension),
+            "mimeType": mime_type,
+            "parents": [generator.choice(folders)],
+            "modifiedTime": (
+                start + timedelta(minutes=generator.randint(0, 4_500_000))
+            ).isoformat(timespec="milliseconds")
+            + "Z",
+        }
+        if extension:
+            item["size"] = str(int(generator.lognormvariate(12, 2.5)))
+        items.append(item)
+    return items
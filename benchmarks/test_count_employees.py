@@ -0,0 +1,34 @@
+from unittest.mock import patch
+
+import pytest
+from pandas import DataFrame
+
+from scripts.count_employees import DocumentReader
+
+
+@pytest.mark.parametrize("rows", [100_000])
+@patch("pandas.read_csv")
+def test_update_data(mocked_read_csv, rows, benchmark, tmp_path, monkeypatch):
+    """Benchmark DocumentReader.update_data on a large sheet"""
+    companies = [f"Company {index}" for index in range(rows)]
+    data = {
+        name: {
+            "url": f"/company/{index}/",
+            "employees": [f"{index:,} associated members"],
+        }
+        for index, name in enumerate(companies)
+    }
+
+    def setup():
+        mocked_read_csv.return_value = DataFrame(
+            {"Companies": companies, "Url": [None] * rows}
+        )
+        return (DocumentReader(), data), {}
+
+    monkeypatch.chdir(tmp_path)
+    with patch("scripts.count_employees.get_filepath"):
+        benchmark.pedantic(
+            lambda reader, data: reader.update_data(data),
+            setup=setup,
+            rounds=5,
+        )
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = {"googleapiclient", "pandas", "playwright", "rich", "spacy"}
+
+
+def import_time(module):
+    """Import the module in a new interpreter, with -X importtime, and
+    return its cumulative import time, in microseconds, and the top level
+    packages imported with it"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    )
+    cumulative, packages = 0, set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if not total.strip().isdigit():
+            continue
+        packages.add(name.strip().split(".")[0])
+        if name.strip() == module and not name.startswith("  "):
+            cumulative = int(total)
+    return cumulative, packages
+
+
+@pytest.mark.parametrize(
+    "module, budget, allowed",
+    [
+        ("scripts.__main__", 100_000, set()),
+        ("scripts.search_engine", 200_000, set()),
+        ("scripts.company_details", 500_000, {"playwright"}),
+        ("scripts.count_employees", 500_000, {"playwright"}),
+    ],
+)
+def test_import_time(module, budget, allowed):
+    """Check the import time budget and the heavy imports of the module"""
+    cumulative, packages = import_time(module)
+    assert packages & HEAVY <= allowed
+    assert 0 < cumulative <= budget
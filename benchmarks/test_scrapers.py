@@ -0,0 +1,50 @@
+import pytest
+
+from scripts.company_details import Scrapper as CompanyDetails
+from scripts.count_employees import Scrapper as CountEmployees
+from scripts.metrics import metrics
+from tests.snapshots import g2_pages, linkedin_pages
+
+
+def stage_means():
+    """Mean seconds of each stage instrumented during the benchmark"""
+    return {
+        f"{stage}_seconds": histogram.sum / histogram.count
+        for stage, histogram in metrics.histograms.items()
+    }
+
+
+@pytest.mark.parametrize("companies", [5])
+def test_get_companies_details(firefox, replay, benchmark, companies):
+    """Benchmark company_details.Scrapper replaying recorded pages"""
+    pages = g2_pages([f"Company {index}" for index in range(companies)])
+    replay("company_details", pages)
+    metrics.reset()
+    testclass = CompanyDetails()
+    result = benchmark.pedantic(
+        testclass.get_companies_details, args=(list(pages),), rounds=3
+    )
+    assert len(result) == companies
+    if benchmark.stats:
+        benchmark.extra_info["pages_per_second"] = (
+            companies / benchmark.stats.stats.mean
+        )
+        benchmark.extra_info.update(stage_means())
+
+
+@pytest.mark.parametrize("companies", [20])
+def test_get_information(chromium, replay, benchmark, companies):
+    """Benchmark count_employees.Scrapper replaying recorded pages"""
+    names = [f"Company {index}" for index in range(companies)]
+    replay("count_employees", linkedin_pages(names))
+    metrics.reset()
+    testclass = CountEmployees()
+    result = benchmark.pedantic(
+        testclass.get_information, args=(names,), rounds=3
+    )
+    assert all(item["employees"] for item in result.values())
+    if benchmark.stats:
+        benchmark.extra_info["pages_per_second"] = (
+            companies / benchmark.stats.stats.mean
+        )
+        benchmark.extra_info.update(stage_means())
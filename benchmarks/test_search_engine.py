@@ -0,0 +1,123 @@
+import os
+from collections import deque
+from functools import lru_cache
+from unittest.mock import patch
+
+import pytest
+import spacy
+
+from benchmarks.listings import drive_listing
+from scripts.search_engine import GoogleDriveAPI, MetaEngine
+
+SCALES = [
+    int(files)
+    for files in os.environ.get("BENCHMARK_SCALES", "10000,100000").split(",")
+]
+
+
+MODEL = os.environ.get("BENCHMARK_MODEL", "")
+
+
+@lru_cache(maxsize=None)
+def language():
+    """The model in BENCHMARK_MODEL, like en_core_web_sm, or by default a
+    blank english pipeline, only tokenizing, so the versioned baselines
+    hold wherever the benchmarks run"""
+    return spacy.load(MODEL) if MODEL else spacy.blank("en")
+
+
+def with_model(benchmark):
+    """Record the spacy model, keeping the baselines of the benchmarks
+    using it apart by model"""
+    meta = language().meta
+    benchmark.extra_info["model"] = f"{meta['lang']}_{meta['name']}"
+
+
+def meta_engine():
+    """MetaEngine with the language already loaded"""
+    engine = MetaEngine()
+    engine._language = language()
+    return engine
+
+
+def keywords(documents):
+    """The first two words of a file name in the listing, so there is at
+    least one match at any scale"""
+    document = next(document for document in documents if len(document) > 1)
+    return (document[0].text, document[1].text)
+
+
+def run(benchmark, peak_memory, files, function, *args):
+    """Benchmark the function, recording throughput and peak memory"""
+    peak_memory(function, *args)
+    benchmark.pedantic(
+        function, args=args, rounds=3, iterations=1, warmup_rounds=1
+    )
+    if benchmark.stats:
+        benchmark.extra_info["files_per_second"] = (
+            files / benchmark.stats.stats.mean
+        )
+
+
+@pytest.mark.parametrize("files", SCALES)
+def test_handle_phrase(benchmark, peak_memory, files):
+    """Benchmark MetaEngine.handle_phrase over every file name"""
+    names = [item["name"] for item in drive_listing(files)]
+    engine = meta_engine()
+
+    def handle_phrases(names):
+        for name in names:
+            engine.handle_phrase(name)
+
+    run(benchmark, peak_memory, files, handle_phrases, names)
+
+
+@pytest.mark.parametrize("files", SCALES)
+def test_extract_texts(benchmark, peak_memory, files):
+    """Benchmark MetaEngine._extract_texts, consuming the documents"""
+    items = drive_listing(files)
+    engine = meta_engine()
+    with_model(benchmark)
+
+    def extract_texts(items):
+        deque(engine._extract_texts(items), maxlen=0)
+
+    run(benchmark, peak_memory, files, extract_texts, items)
+
+
+@pytest.mark.parametrize("files", SCALES)
+@patch("scripts.search_engine.logger")
+def test_data_processing(mocked_logger, benchmark, peak_memory, files):
+    """Benchmark MetaEngine._data_processing over processed documents"""
+    engine = meta_engine()
+    documents = list(engine._extract_texts(drive_listing(files)))
+    with_model(benchmark)
+    run(
+        benchmark,
+        peak_memory,
+        files,
+        engine._data_processing,
+        documents,
+        keywords(documents),
+    )
+    assert mocked_logger.info.called
+
+
+@pytest.mark.parametrize("files", SCALES)
+def test_list_files(benchmark, peak_memory, files):
+    """Benchmark GoogleDriveAPI.list_files, building the table"""
+    items = drive_listing(files)
+    run(benchmark, peak_memory, files, GoogleDriveAPI().list_files, items)
+
+
+@pytest.mark.parametrize("files", SCALES)
+def test_get_size_format(benchmark, peak_memory, files):
+    """Benchmark GoogleDriveAPI.get_size_format over every file size"""
+    sizes = [int(item.get("size", 0)) for item in drive_listing(files)]
+    api = GoogleDriveAPI()
+
+    def get_size_formats(sizes):
+        for size in sizes:
+            api.get_size_format(size)
+
+    run(benchmark, peak_memory, files, get_size_formats, sizes)
@@ -1,7 +1,10 @@
+import csv
 import logging
+from functools import lru_cache
+from importlib import import_module
 from pathlib import Path
-
-from rich.logging import RichHandler
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+from urllib.parse import urlsplit, urlunsplit
 
 try:
     from dotenv import find_dotenv, load_dotenv
@@ -10,15 +13,71 @@ try:
 except ModuleNotFoundError:
     pass
 
+
+class LazyRichHandler(logging.Handler):
+    """LazyRichHandler class, importing rich only on the first record"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._handler: Optional[logging.Handler] = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Function created to delegate the record to the rich handler.
+        Args:
+            record (logging.LogRecord): The record to be logged
+        """
+        if self._handler is None:
+            from rich.logging import RichHandler
+
+            self._handler = RichHandler(rich_tracebacks=True)
+        self._handler.handle(record)
+
+
+class LazyImport:
+    """LazyImport class, standing for a module attribute which is only
+    imported when it is called or one of its attributes is used.
+    """
+
+    def __init__(self, module: str, name: str) -> None:
+        self._module = module
+        self._name = name
+
+    def _resolve(self) -> Any:
+        """Function created to import the attribute.
+        Returns:
+            Any: Returns the attribute of the module.
+        """
+        return getattr(import_module(self._module), self._name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._resolve(), attribute)
+
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
-rich_handler = RichHandler(rich_tracebacks=True)
+rich_handler = LazyRichHandler()
 logging.getLogger().handlers = [rich_handler]
 
 
+@lru_cache(maxsize=None)
+def _list_folder(folder: str) -> Dict[str, str]:
+    """Function created to list the files of a folder only once.
+    Args:
+        folder (str): The folder resolved path
+    Returns:
+        Dict[str, str]: Returns the file paths, by file name.
+    """
+    return {
+        file.name.strip(): file.as_posix() for file in Path(folder).iterdir()
+    }
+
+
 def get_filepath(filename: str, folder_name: str = "examples") -> str:
     """Function created to take the full path of the base files to
     execute in the scripts.
@@ -30,10 +89,60 @@ def get_filepath(filename: str, folder_name: str = "examples") -> str:
         str: Returns the name of the file, assuming that it has been
         placed in the root folder or in the folder where it should be placed.
     """
-    result = filename
-    source = Path(folder_name).resolve()
-    list_files = [file for file in source.iterdir()]
-    for file in list_files:
-        if file.name.strip() == filename.strip():
-            result = file.as_posix()
-    return result
+    source = Path(folder_name).resolve().as_posix()
+    return _list_folder(source).get(filename.strip(), filename)
+
+
+def normalize_url(url: str) -> str:
+    """Function created to normalize urls, so the same page written in
+    different ways is only visited once.
+    Args:
+        url (str): The url as written in the file
+    Returns:
+        str: Returns the url with scheme and host in lower case, without
+        fragment and trailing slash, or empty when there is no url.
+    """
+    url = url.strip()
+    if not url:
+        return ""
+    if "://" not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/"),
+            parts.query,
+            "",
+        )
+    )
+
+
+def read_rows(
+    filepath: str, key: str, normalize: Callable[[str], str] = str.strip
+) -> Iterator[Dict[str, str]]:
+    """Function created to stream the rows of a csv file, one at a time,
+    without loading the whole file. Raises ValueError when the file has no
+    key column.
+    Args:
+        filepath (str): The csv file path
+        key (str): Column used to identify each row
+        normalize (Callable[[str], str], optional): Function applied to the
+        key column. Defaults to str.strip.
+    Returns:
+        Iterator[Dict[str, str]]: Returns a generator of rows, skipping the
+        ones with empty or repeated key.
+    """
+    seen: Set[str] = set()
+    with open(filepath, newline="", encoding="utf-8-sig") as file:
+        reader = csv.DictReader(file)
+        if key not in (reader.fieldnames or []):
+            raise ValueError(f"Column {key} not found in {filepath}.")
+        for row in reader:
+            value = normalize(row.get(key) or "")
+            if not value or value in seen:
+                continue
+            seen.add(value)
+            row[key] = value
+            yield row
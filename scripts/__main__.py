@@ -0,0 +1,54 @@
+from argparse import ArgumentParser
+from importlib import import_module
+from typing import List, Optional
+
+
+def build_parser() -> ArgumentParser:
+    """Function created to build the command line parser, with one
+    subcommand for each script.
+    Returns:
+        ArgumentParser: Returns the parser.
+    """
+    parser = ArgumentParser(
+        prog="python -m scripts",
+        description="A collection of challenges, one subcommand each.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    search = subparsers.add_parser(
+        "search_engine",
+        help="List the Google Drive files, or search them by keywords.",
+    )
+    search.add_argument(
+        "keywords", nargs="*", help="Words to be matched in the file names."
+    )
+    subparsers.add_parser(
+        "company_details",
+        help="Show the G2 details of the companies in G2_FILENAME.",
+    )
+    subparsers.add_parser(
+        "count_employees",
+        help="Count the LinkedIn employees of the companies in "
+        "COMPANY_FILENAME.",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Function created to run the script chosen, importing only its module
+    and, through it, only the dependencies it needs.
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+        Defaults to None, reading them from sys.argv.
+    """
+    arguments = build_parser().parse_args(argv)
+    module = import_module(f"scripts.{arguments.command}")
+    app = module.BuildManager()
+    if arguments.command == "search_engine":
+        app.main([arguments.command, *arguments.keywords])
+    else:
+        app.main()
+
+
+if __name__ == "__main__":
+    """Context for running the main"""
+    main()
@@ -1,12 +1,19 @@
 import os
 import sys
-from typing import Any, Dict, List
-
-from pandas import read_csv
-from playwright.sync_api import Browser, Locator, Page, sync_playwright
+from typing import Any, Dict, Iterable, Iterator, List
+
+from playwright.sync_api import (
+    Browser,
+    Locator,
+    Page,
+    Playwright,
+    sync_playwright,
+)
 from tabulate import tabulate  # type: ignore
 
-from . import get_filepath, logger
+from . import get_filepath, logger, normalize_url, read_rows
+from .metrics import metrics
+from .replay import Snapshots
 
 
 class DataHandle:
@@ -15,15 +22,15 @@ class DataHandle:
     def __init__(self) -> None:
         self._filename = os.environ["G2_FILENAME"]
         self._sourcefile = get_filepath(self._filename)
-        self._dataframe = read_csv(self._sourcefile)
 
-    def get_companies_urls(self) -> List[str]:
-        """Function created to retrieve company urls
+    def get_companies_urls(self) -> Iterator[str]:
+        """Function created to retrieve company urls, streamed from the
+        file, normalized and without repetitions.
         Returns:
-            List[str]: Return list companies url
+            Iterator[str]: Return a generator of companies url
         """
-        result = self._dataframe["Url"].to_list()
-        return result
+        for row in read_rows(self._sourcefile, "Url", normalize_url):
+            yield row["Url"]
 
     def _processing_details(self, items: List[Any]) -> Dict[Any, Any]:
         """Function created to process the scraped datelines and format
@@ -75,39 +82,39 @@ class Scrapper:
 
     def __init__(self) -> None:
         self._headless = bool(int(os.environ["HEADLESS_MODE"]))
+        self._snapshots = Snapshots("company_details")
 
-    def _get_browser(self) -> Browser:
+    def _get_browser(self, player: Playwright) -> Browser:
         """Function created to instantiate the browser.
+        Args:
+            player (Playwright): Receive the playwright instance
         Returns:
             Browser: Returns the browser.
         """
-        player = sync_playwright().start()
         browser = player.firefox.launch(headless=self._headless)
         return browser
 
     def _avoid_security_question(self, page: Page) -> None:
         """Function responsible for validating the cloudfare captcha and
-        requesting human intervention to continue the process.
+        requesting human intervention to continue the process. Only the
+        pages showing the captcha are counted and waited for.
         Args:
             page (Page): Receive a page instance
         """
-        not_safe = True
-        while not_safe:
-            if (
-                page.locator("#challenge-running").all_inner_texts()
-                and self._headless
-            ):
-                logger.warning("Captcha page! Human intervention is needed!")
-                logger.error("Try again with headless mode active")
-                sys.exit(1)
-            if not page.locator("#challenge-running").all_inner_texts():
-                logger.info(
-                    "Captcha solved. Continuing with the rest of the process."
-                )
-                not_safe = False
-                page.wait_for_timeout(2000)
-                break
-            page.wait_for_timeout(5000)
+        if not page.locator("#challenge-running").all_inner_texts():
+            return
+        logger.warning("Captcha page! Human intervention is needed!")
+        metrics.count("captcha_pages")
+        if self._headless:
+            logger.error("Try again with headless mode active")
+            sys.exit(1)
+        with metrics.span("captcha_wait"):
+            while page.locator("#challenge-running").all_inner_texts():
+                page.wait_for_timeout(5000)
+            logger.info(
+                "Captcha solved. Continuing with the rest of the process."
+            )
+            page.wait_for_timeout(2000)
 
     def _processing_data(self, detail_page: Locator) -> Dict[Any, Any]:
         """Function created to scrape the details from the page of the
@@ -134,21 +141,18 @@ class Scrapper:
                 detail[text] = item.locator("p").last.all_inner_texts()[0]
         return detail
 
-    def get_companies_details(self, companies_urls: List[str]) -> List[Any]:
-        """Main function, being responsible for building the scraping process,
-        and building the list of scraped data.
+    def _scrape_company(self, page: Page, url: str) -> Dict[Any, Any]:
+        """Function created to scrape the details of a company page.
         Args:
-            companies_urls (List[str]): Receives the list of company urls.
-
+            page (Page): Receive a page instance
+            url (str): The company url
         Returns:
-            List: Returns the list of scraped company data.
+            Dict[Any, Any]: Returns the details scraped, with the name.
         """
-        result = []
-        browser = self._get_browser()
-        page = browser.new_page()
-        for url in companies_urls:
+        with metrics.span("page_navigation"):
             page.goto(url)
-            self._avoid_security_question(page)
+        self._avoid_security_question(page)
+        with metrics.span("extraction"):
             company_name = (
                 page.locator("div.rated-item__info")
                 .locator("h2")
@@ -156,8 +160,34 @@ class Scrapper:
             )
             detail_page = page.locator("div.show-for-xlarge").locator(".paper")
             data = self._processing_data(detail_page)
-            data.update({"Name": company_name})
-            result.append(data)
+        data.update({"Name": company_name})
+        metrics.count("pages")
+        return data
+
+    def get_companies_details(
+        self, companies_urls: Iterable[str]
+    ) -> List[Any]:
+        """Main function, being responsible for building the scraping process,
+        and building the list of scraped data.
+        Args:
+            companies_urls (Iterable[str]): Receives the company urls.
+
+        Returns:
+            List: Returns the list of scraped company data.
+        """
+        result = []
+        with sync_playwright() as player:
+            with metrics.span("session"):
+                browser = self._get_browser(player)
+                context = browser.new_context()
+                self._snapshots.route(context)
+                page = context.new_page()
+            try:
+                for url in companies_urls:
+                    result.append(self._scrape_company(page, url))
+            finally:
+                context.close()
+                browser.close()
         return result
 
 
@@ -170,9 +200,10 @@ class BuildManager:
 
     def main(self) -> None:
         """Main function to build the script"""
-        companies_url = self._handle_data.get_companies_urls()
-        details = self._scrapper.get_companies_details(companies_url)
-        self._handle_data.show_details(details)
+        with metrics.run("company_details"):
+            companies_url = self._handle_data.get_companies_urls()
+            details = self._scrapper.get_companies_details(companies_url)
+            self._handle_data.show_details(details)
 
 
 if __name__ == "__main__":
@@ -1,11 +1,39 @@
+from __future__ import annotations
+
+import asyncio
 import os
+import stat
 import sys
-from typing import Any, Dict, List
+from datetime import datetime, timedelta
+from functools import partial
+from itertools import chain, islice
+from tempfile import NamedTemporaryFile
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+)
+from urllib.parse import urljoin, urlsplit
+
+from playwright.async_api import (
+    BrowserContext,
+    Error,
+    Page,
+    Response,
+    async_playwright,
+)
 
-from pandas import read_csv
-from playwright.sync_api import Browser, Page, sync_playwright
+from . import get_filepath, logger, read_rows
+from .metrics import metrics
+from .replay import Snapshots
 
-from . import get_filepath, logger
+if TYPE_CHECKING:
+    from pandas import DataFrame, Series
 
 
 class DocumentReader:
@@ -13,16 +41,127 @@ class DocumentReader:
 
     def __init__(self) -> None:
         self._filename = os.environ["COMPANY_FILENAME"]
-        self._sourcefile = get_filepath(self._filename)
-        self._dataframe = read_csv(self._sourcefile)
+        self._example = get_filepath(self._filename)
+        self._sourcefile = self._get_sourcefile()
+        self._refresh_days = os.environ.get("REFRESH_DAYS")
+
+    def _get_sourcefile(self) -> str:
+        """Function created to choose the file to be read, preferring the
+        one written by a previous run, with the urls and update dates, to
+        the example file.
+        Returns:
+            str: Returns the path of the file to be read.
+        """
+        sourcefile = self._example
+        if os.path.exists(self._filename):
+            sourcefile = self._filename
+        logger.info(f"Reading the companies from {sourcefile}")
+        return sourcefile
+
+    def _added_companies(self, names: Set[str]) -> Iterator[str]:
+        """Function created to find the companies added to the example file
+        after the previous run wrote its file.
+        Args:
+            names (Set[str]): The companies already in the file read
+        Returns:
+            Iterator[str]: Return a generator of the new company names.
+        """
+        example = os.path.abspath(self._example)
+        if example == os.path.abspath(self._sourcefile):
+            return
+        if not os.path.exists(example):
+            return
+        for row in read_rows(example, "Companies"):
+            if row["Companies"] not in names:
+                yield row["Companies"]
+
+    def _read_rows(self) -> Iterator[Dict[str, str]]:
+        """Function created to stream the rows of the file read, followed by
+        the companies added to the example file, without url and update
+        date.
+        Returns:
+            Iterator[Dict[str, str]]: Return a generator of rows
+        """
+        names: Set[str] = set()
+        for row in read_rows(self._sourcefile, "Companies"):
+            names.add(row["Companies"])
+            yield row
+        for name in self._added_companies(names):
+            yield {"Companies": name}
+
+    def _is_outdated(self, updated: Optional[str], limit: datetime) -> bool:
+        """Function created to check if a row must be scraped again.
+        Args:
+            updated (Optional[str]): The last update of the row
+            limit (datetime): Rows updated before it are outdated
+        Returns:
+            bool: Returns True when the row is outdated or never updated.
+        """
+        try:
+            return datetime.fromisoformat(updated or "") < limit
+        except (TypeError, ValueError):
+            return True
+
+    def get_companies(self) -> Iterator[str]:
+        """Responsible for streaming the company names from the file. When
+        REFRESH_DAYS is defined, only the companies never updated or
+        updated before that age are returned.
+        Returns:
+            Iterator[str]: Return a generator of company names
+        """
+        limit = None
+        if self._refresh_days:
+            limit = datetime.now() - timedelta(days=int(self._refresh_days))
+        for row in self._read_rows():
+            if limit and not self._is_outdated(row.get("Updated"), limit):
+                continue
+            yield row["Companies"]
+
+    def get_urls(self) -> Dict[str, str]:
+        """Responsible for collecting the company urls already known.
+        Returns:
+            Dict[str, str]: Return a dictionary of company name and url
+        """
+        return {
+            row["Companies"]: row["Url"]
+            for row in self._read_rows()
+            if row.get("Url")
+        }
+
+    def _parse_employees(self, employees: Series) -> Series:
+        """Function created to convert the employees texts, like
+        "312,000 associated members", into an integer column.
+        Args:
+            employees (Series): Receive the employees texts or numbers
+        Returns:
+            Series: Returns a nullable integer series.
+        """
+        from pandas import to_numeric
+        from pandas.api.types import is_numeric_dtype
+
+        if is_numeric_dtype(employees):
+            return employees.astype("Int64")
+        numbers = employees.astype("string").str.split().str[0]
+        numbers = numbers.str.replace(r"\D", "", regex=True)
+        return to_numeric(numbers, errors="coerce").astype("Int64")
 
-    def get_companies(self) -> List[str]:
-        """Responsible for collecting the list of company names.
+    def _build_results(self, data: Dict[Any, Any]) -> DataFrame:
+        """Function created to build a dataframe, indexed by company name,
+        with the companies scraped successfully.
+        Args:
+            data (Dict[Any, Any]): Recieve a data with information to url
+            and employees.
         Returns:
-            List[str]: Return a list of string company names
+            DataFrame: Returns the url and employees of each company.
         """
-        company_names = self._dataframe["Companies"].to_list()
-        return company_names
+        from pandas import DataFrame
+
+        results = DataFrame.from_dict(
+            data, orient="index", columns=["url", "employees"]
+        )
+        results = results[results["employees"].str.len() > 0]
+        employees = self._parse_employees(results["employees"].str[0])
+        return results.assign(employees=employees)
 
     def update_data(self, data: Dict[Any, Any]) -> None:
         """Function responsible for updating the dataframe and then
@@ -31,21 +170,67 @@ class DocumentReader:
             data (Dict[Any, Any]):Recieve a data with information to url
             and employees.
         """
-        self._dataframe.insert(2, "Employees", "")
-        self._dataframe.astype(str)
-        for name in self.get_companies():
-            employees = data[name].get("employees")[0]
-            employees = employees.split()
-            idx = self._dataframe.index[
-                self._dataframe["Companies"] == name
-            ].tolist()[0]
-            self._dataframe.at[idx, "Url"] = data[name].get("url")
-            self._dataframe.at[idx, "Employees"] = employees[0]
-        self._build_file()
+        from pandas import NA, DataFrame, concat, read_csv
 
-    def _build_file(self) -> None:
-        """Function create to build a new CSV"""
-        self._dataframe.to_csv(self._filename, index=False)
+        dataframe = read_csv(self._sourcefile)
+        names = dataframe["Companies"].astype("string").str.strip()
+        added = list(self._added_companies(set(names.dropna())))
+        if added:
+            dataframe = concat(
+                [dataframe, DataFrame({"Companies": added})],
+                ignore_index=True,
+            )
+        if "Employees" not in dataframe.columns:
+            dataframe.insert(2, "Employees", NA)
+        if "Updated" not in dataframe.columns:
+            dataframe["Updated"] = NA
+        results = self._build_results(data)
+        companies = dataframe["Companies"].astype("string").str.strip()
+        scraped = companies.isin(results.index)
+        updated = datetime.now().isoformat(timespec="seconds")
+        employees = self._parse_employees(dataframe["Employees"])
+        dataframe["Employees"] = companies.map(results["employees"]).where(
+            scraped, employees
+        )
+        dataframe["Url"] = companies.map(results["url"]).where(
+            scraped, dataframe["Url"]
+        )
+        dataframe["Updated"] = dataframe["Updated"].where(~scraped, updated)
+        with metrics.span("csv_write"):
+            self._build_file(dataframe)
+
+    def _file_mode(self) -> int:
+        """Function created to take the permissions of the file written,
+        since the temporary file is only readable by its owner.
+        Returns:
+            int: Returns the mode of the previous file, or the default mode
+            of a new file under the current umask.
+        """
+        try:
+            return stat.S_IMODE(os.stat(self._filename).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+
+    def _build_file(self, dataframe: DataFrame) -> None:
+        """Function create to build a new CSV, written in a temporary file
+        and then renamed, so the previous file is never left half written.
+        Args:
+            dataframe (DataFrame): Receive the dataframe to be written
+        """
+        folder = os.path.dirname(os.path.abspath(self._filename))
+        with NamedTemporaryFile(
+            "w", dir=folder, suffix=".csv", delete=False, newline=""
+        ) as file:
+            try:
+                dataframe.to_csv(file, index=False)
+                os.chmod(file.name, self._file_mode())
+            except BaseException:
+                os.remove(file.name)
+                raise
+        os.replace(file.name, self._filename)
+        self._sourcefile = self._filename
 
 
 class Scrapper:
@@ -53,80 +238,332 @@ class Scrapper:
 
     def __init__(self) -> None:
         self._headless = bool(int(os.environ["HEADLESS_MODE"]))
+        self._base_url = "https://www.linkedin.com"
         self._url = "https://www.linkedin.com/home"
+        self._feed_url = "https://www.linkedin.com/feed/"
         self._login = os.environ["ACCOUNT_NAME"]
         self._password = os.environ["ACCOUNT_PASSWORD"]
+        self._workers = max(int(os.environ.get("MAX_WORKERS", 1)), 1)
+        self._api_timeout = 10
+        self._snapshots = Snapshots("count_employees")
 
-    def _get_browser(self) -> Browser:
-        """Function created to instantiate the browser.
-        Returns:
-            Browser: Returns the browser.
-        """
-        player = sync_playwright().start()
-        browser = player.chromium.launch(headless=self._headless)
-        return browser
-
-    def _linkedin_login(self, page: Page) -> None:
+    async def _linkedin_login(self, page: Page) -> None:
         """Function created to enter linkedin
         Args:
             page (Page): Receive a page instance
         """
-        page.goto(self._url)
-        page.locator("input#session_key").fill(self._login)
-        page.locator("input#session_password").fill(self._password)
-        page.get_by_role("button", name="Sign in").click()
-        if "checkpoint/challenge" in page.url:
-            logger.warning("Captcha page! Human intervention is needed!")
-            while True:
-                if "checkpoint/challenge" not in page.url:
-                    logger.info(
-                        "Captcha solved. Continuing with the rest of the process."
-                    )
-                    break
-                page.wait_for_timeout(2000)
-            page.wait_for_timeout(5000)
-        elif "checkpoint/challenge" not in page.url:
+        await page.goto(self._url)
+        await page.locator("input#session_key").fill(self._login)
+        await page.locator("input#session_password").fill(self._password)
+        await page.get_by_role("button", name="Sign in").click()
+        await page.wait_for_load_state()
+        if "checkpoint/challenge" not in page.url:
             logger.info(
                 "Sometimes the captcha appears, not this time, just keep going!"
             )
-        else:
+            return
+        logger.warning("Captcha page! Human intervention is needed!")
+        metrics.count("captcha_pages")
+        if self._headless:
             logger.error("Captcha page! Aborting due to headless mode...")
             sys.exit(1)
+        with metrics.span("captcha_wait"):
+            while "checkpoint/challenge" in page.url:
+                await page.wait_for_timeout(2000)
+            logger.info(
+                "Captcha solved. Continuing with the rest of the process."
+            )
+            await page.wait_for_timeout(5000)
 
-    def get_information(self, companies: List[str]) -> Dict[Any, Any]:
-        """Function created to get data from linkedin.
+    def _people_url(self, url: str) -> str:
+        """Function created to build the people page of a company url.
         Args:
-            companies (List[str]): Receive a list of company names
+            url (str): The company url, absolute or relative
         Returns:
-            Dict[Any, Any]: Returns a dictionary containing the url and
-            number of employees for each company.
+            str: Returns the absolute url of the company people page.
         """
-        data = {item: {"url": "", "employees": []} for item in companies}
-        browser = self._get_browser()
-        page = browser.new_page(locale="en-US")
-        self._linkedin_login(page)
-        for name in companies:
-            searchbar = page.locator(".search-global-typeahead__input")
-            searchbar.click()
-            searchbar.fill(name)
-            page.keyboard.press("Enter")
-            link = page.get_by_role("link", name=name, exact=True)
-            data[name]["url"] = link.get_attribute("href")
-            link.click()
-            page.locator(".org-page-navigation__item-anchor").filter(
+        parts = urlsplit(urljoin(self._base_url, url))
+        path = parts.path.rstrip("/")
+        if not path.endswith("/people"):
+            path = f"{path}/people"
+        return f"{parts.scheme}://{parts.netloc}{path}/"
+
+    def _company_slug(self, url: str) -> str:
+        """Function created to take the company identifier of a url, like
+        "ibm" in "https://www.linkedin.com/company/ibm/people/".
+        Args:
+            url (str): The company url, absolute or relative
+        Returns:
+            str: Returns the identifier in lower case, or empty when the url
+            is not of a company.
+        """
+        parts = urlsplit(urljoin(self._base_url, url)).path.split("/")
+        if "company" not in parts[:-1]:
+            return ""
+        return parts[parts.index("company") + 1].lower()
+
+    def _is_company(
+        self, entity: Dict[Any, Any], name: str, slug: str
+    ) -> bool:
+        """Function created to check if an entity is the company scraped,
+        and not one of the others loaded by the page, like search results
+        or similar pages. The identifier is compared when the entity has
+        one, and the name otherwise.
+        Args:
+            entity (Dict[Any, Any]): The entity found in the payload
+            name (str): The company name
+            slug (str): The company identifier
+        Returns:
+            bool: Returns True when the entity is the company.
+        """
+        identifiers = {
+            str(entity.get("universalName") or "").lower(),
+            self._company_slug(str(entity.get("url") or "")),
+        } - {""}
+        if identifiers:
+            return slug in identifiers
+        return str(entity.get("name") or "").casefold() == name.casefold()
+
+    def _find_company(
+        self, payload: Any, name: str, slug: str
+    ) -> Optional[Dict[Any, Any]]:
+        """Function created to search, in a json payload loaded by the page,
+        the entity of the company carrying the number of employees.
+        Args:
+            payload (Any): The decoded json payload
+            name (str): The company name
+            slug (str): The company identifier
+        Returns:
+            Optional[Dict[Any, Any]]: Returns the company entity, or None.
+        """
+        if isinstance(payload, dict):
+            if isinstance(payload.get("staffCount"), int) and self._is_company(
+                payload, name, slug
+            ):
+                return payload
+            values = list(payload.values())
+        elif isinstance(payload, list):
+            values = payload
+        else:
+            return None
+        for value in values:
+            company = self._find_company(value, name, slug)
+            if company:
+                return company
+        return None
+
+    async def _read_people_page(self, page: Page) -> List[str]:
+        """Function created to scrape the employees from the rendered
+        people page, opening the People tab when needed.
+        Args:
+            page (Page): Receive a page instance, on the company page
+        Returns:
+            List[str]: Returns the texts of the employees header.
+        """
+        if "/people" not in page.url:
+            await page.locator(".org-page-navigation__item-anchor").filter(
                 has_text="People"
             ).click()
-            page.wait_for_timeout(2000)
-            page.wait_for_selector(".org-people__header-spacing-carousel")
-            employee_card = page.locator(
-                ".org-people__header-spacing-carousel"
-            )
-            data[name]["employees"] = employee_card.locator(
-                "h2"
-            ).all_inner_texts()
-        browser.close()
+            await page.wait_for_timeout(2000)
+        await page.wait_for_selector(".org-people__header-spacing-carousel")
+        employee_card = page.locator(".org-people__header-spacing-carousel")
+        return await employee_card.locator("h2").all_inner_texts()
+
+    async def _search_company(self, page: Page, name: str) -> str:
+        """Function created to search a company and take its url.
+        Args:
+            page (Page): Receive a page instance, already logged in
+            name (str): The company name
+        Returns:
+            str: Returns the url of the company found.
+        """
+        searchbar = page.locator(".search-global-typeahead__input")
+        await searchbar.click()
+        await searchbar.fill(name)
+        await page.keyboard.press("Enter")
+        link = page.get_by_role("link", name=name, exact=True)
+        url = await link.get_attribute("href")
+        if not url:
+            raise Error(f"No company link found for {name}")
+        return url
+
+    async def _capture_company(
+        self,
+        response: Response,
+        company: "asyncio.Future[Dict[Any, Any]]",
+        name: str,
+        slug: str,
+    ) -> None:
+        """Function created to listen the api responses of the page and
+        resolve the future with the entity of the company scraped.
+        Args:
+            response (Response): Receive a response loaded by the page
+            company (asyncio.Future[Dict[Any, Any]]): Future to be resolved
+            name (str): The company name
+            slug (str): The company identifier
+        """
+        if company.done() or "/voyager/api/" not in response.url:
+            return
+        if "json" not in response.headers.get("content-type", ""):
+            return
+        try:
+            payload = await response.json()
+        except (Error, ValueError):
+            return
+        found = self._find_company(payload, name, slug)
+        if found and not company.done():
+            company.set_result(found)
+
+    async def _scrape_company(
+        self, page: Page, name: str, url: Optional[str] = None
+    ) -> Dict[Any, Any]:
+        """Function created to get the employees of a company, going
+        straight to its people page when the url is known or searching for
+        it otherwise. The count is read from the api responses loaded by the
+        page, falling back to the rendered people page when none of the
+        company arrives in time.
+        Args:
+            page (Page): Receive a page instance, already logged in
+            name (str): The company name
+            url (Optional[str], optional): The company url already known.
+            Defaults to None.
+        Returns:
+            Dict[Any, Any]: Returns the url and employees of the company.
+        """
+        if not url:
+            with metrics.span("company_search"):
+                url = await self._search_company(page, name)
+        loop = asyncio.get_running_loop()
+        company: "asyncio.Future[Dict[Any, Any]]" = loop.create_future()
+        on_response = partial(
+            self._capture_company,
+            company=company,
+            name=name,
+            slug=self._company_slug(url),
+        )
+        page.on("response", on_response)
+        try:
+            with metrics.span("page_navigation"):
+                await page.goto(self._people_url(url))
+            with metrics.span("extraction"):
+                try:
+                    found = await asyncio.wait_for(company, self._api_timeout)
+                    employees = [str(found["staffCount"])]
+                    url = found.get("url") or url
+                    metrics.count("api_extractions")
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"No api response for {name}, reading page."
+                    )
+                    employees = await self._read_people_page(page)
+                    metrics.count("dom_extractions")
+        finally:
+            page.remove_listener("response", on_response)
+        return {"url": url, "employees": employees}
+
+    async def _worker(
+        self,
+        context: BrowserContext,
+        companies: Iterator[str],
+        data: Dict[Any, Any],
+        urls: Dict[str, str],
+    ) -> None:
+        """Function created to consume company names, shared between the
+        workers, with a dedicated page, storing each result as soon as it
+        is finished.
+        Args:
+            context (BrowserContext): Receive the authenticated context
+            companies (Iterator[str]): Iterator with the company names
+            data (Dict[Any, Any]): Dictionary where the results are stored
+            urls (Dict[str, str]): Company urls already known
+        """
+        page = await context.new_page()
+        await self._open_feed(page)
+        for name in companies:
+            data[name] = {"url": "", "employees": []}
+            try:
+                data[name] = await self._scrape_company(
+                    page, name, urls.get(name)
+                )
+                metrics.count("companies_scraped")
+            except Error as error:
+                logger.error(f"Could not collect {name}: {error}")
+                metrics.count("companies_failed")
+                await self._open_feed(page)
+        await page.close()
+
+    async def _open_feed(self, page: Page) -> None:
+        """Function created to take the page to the feed, where the search
+        bar is, logging the failure instead of stopping the worker.
+        Args:
+            page (Page): Receive a page instance
+        """
+        try:
+            await page.goto(self._feed_url)
+        except Error as error:
+            logger.error(f"Could not open the feed: {error}")
+            metrics.count("navigation_failed")
+
+    async def _collect(
+        self, companies: Iterable[str], urls: Dict[str, str]
+    ) -> Dict[Any, Any]:
+        """Function created to login and distribute the companies between
+        the workers, all sharing the same browser context. No more workers
+        than companies are started, and no login happens without them.
+        Args:
+            companies (Iterable[str]): Receive the company names
+            urls (Dict[str, str]): Company urls already known
+        Returns:
+            Dict[Any, Any]: Returns a dictionary containing the url and
+            number of employees for each company.
+        """
+        data: Dict[Any, Any] = {}
+        names = iter(companies)
+        first = list(islice(names, self._workers))
+        if not first:
+            logger.info("No company to collect, skipping the login.")
+            return data
+        names = chain(first, names)
+        async with async_playwright() as player:
+            with metrics.span("session"):
+                browser = await player.chromium.launch(headless=self._headless)
+                context = await browser.new_context(locale="en-US")
+                await self._snapshots.route_async(context)
+            try:
+                with metrics.span("login"):
+                    page = await context.new_page()
+                    await self._linkedin_login(page)
+                await page.close()
+                workers = await asyncio.gather(
+                    *[
+                        self._worker(context, names, data, urls)
+                        for _ in range(len(first))
+                    ],
+                    return_exceptions=True,
+                )
+                for error in workers:
+                    if isinstance(error, Exception):
+                        logger.error(f"A worker stopped: {error!r}")
+                        metrics.count("workers_failed")
+            finally:
+                await context.close()
+                await browser.close()
         return data
 
+    def get_information(
+        self, companies: Iterable[str], urls: Optional[Dict[str, str]] = None
+    ) -> Dict[Any, Any]:
+        """Function created to get data from linkedin.
+        Args:
+            companies (Iterable[str]): Receive the company names
+            urls (Optional[Dict[str, str]], optional): Company urls already
+            known, those are visited directly. Defaults to None.
+        Returns:
+            Dict[Any, Any]: Returns a dictionary containing the url and
+            number of employees for each company.
+        """
+        return asyncio.run(self._collect(companies, urls or {}))
+
 
 class BuildManager:
     """BuildManager class"""
@@ -137,9 +574,11 @@ class BuildManager:
 
     def main(self) -> None:
         """Main function to build the script"""
-        companies = self._document_reader.get_companies()
-        information = self._scrapper.get_information(companies)
-        self._document_reader.update_data(information)
+        with metrics.run("count_employees"):
+            companies = self._document_reader.get_companies()
+            urls = self._document_reader.get_urls()
+            information = self._scrapper.get_information(companies, urls)
+            self._document_reader.update_data(information)
         message = f"All information are collected, please check on your {self._document_reader._filename}!"
         logger.info(message)
 
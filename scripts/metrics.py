@@ -0,0 +1,237 @@
+import cProfile
+import json
+import os
+import tracemalloc
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from . import logger
+
+T = TypeVar("T")
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram:
+    """Histogram class"""
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Function created to add a duration to the histogram.
+        Args:
+            seconds (float): The duration observed
+        """
+        index = next(
+            (i for i, bound in enumerate(BUCKETS) if seconds <= bound),
+            len(BUCKETS),
+        )
+        self.buckets[index] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self) -> List[int]:
+        """Function created to accumulate the buckets, as prometheus does.
+        Returns:
+            List[int]: Returns the number of observations up to each bound.
+        """
+        result, total = [], 0
+        for value in self.buckets:
+            total += value
+            result.append(total)
+        return result
+
+
+class Metrics:
+    """Metrics class"""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self, script: str = "") -> None:
+        """Function created to discard the metrics collected so far.
+        Args:
+            script (str, optional): The script name. Defaults to "".
+        """
+        self._script = script
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, float] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Function created to record the duration of a stage.
+        Args:
+            stage (str): The stage name
+            seconds (float): The duration of the stage
+        """
+        self.histograms.setdefault(stage, Histogram()).observe(seconds)
+
+    def count(self, event: str, value: int = 1) -> None:
+        """Function created to increment the counter of an event.
+        Args:
+            event (str): The event name
+            value (int, optional): The increment. Defaults to 1.
+        """
+        self.counters[event] = self.counters.get(event, 0) + value
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Function created to time the code run inside the context.
+        Args:
+            stage (str): The stage name
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, perf_counter() - start)
+
+    def iterate(self, stage: str, items: Iterable[T]) -> Iterator[T]:
+        """Function created to time each item produced by a lazy iterable,
+        like the spacy pipe, without consuming it ahead.
+        Args:
+            stage (str): The stage name
+            items (Iterable[T]): The iterable to be timed
+        Returns:
+            Iterator[T]: Returns a generator with the same items.
+        """
+        iterator = iter(items)
+        while True:
+            start = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.observe(stage, perf_counter() - start)
+            yield item
+
+    def to_json(self) -> str:
+        """Function created to export the metrics as json.
+        Returns:
+            str: Returns the metrics in a json document.
+        """
+        histograms = {
+            stage: {
+                "count": histogram.count,
+                "sum": histogram.sum,
+                "buckets": dict(
+                    zip(
+                        [str(bound) for bound in BUCKETS] + ["+Inf"],
+                        histogram.cumulative(),
+                    )
+                ),
+            }
+            for stage, histogram in self.histograms.items()
+        }
+        data = {
+            "script": self._script,
+            "histograms": histograms,
+            "counters": self.counters,
+            "gauges": self.gauges,
+        }
+        return json.dumps(data, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Function created to export the metrics in the prometheus text
+        format, to be collected by the node exporter textfile collector.
+        Returns:
+            str: Returns the metrics in prometheus text format.
+        """
+        script = f'script="{self._script}"'
+        lines = ["# TYPE scripts_stage_seconds histogram"]
+        for stage, histogram in self.histograms.items():
+            labels = f'{script},stage="{stage}"'
+            bounds = [str(bound) for bound in BUCKETS] + ["+Inf"]
+            for bound, value in zip(bounds, histogram.cumulative()):
+                lines.append(
+                    f'scripts_stage_seconds_bucket{{{labels},le="{bound}"}} '
+                    f"{value}"
+                )
+            lines.append(
+                f"scripts_stage_seconds_sum{{{labels}}} {histogram.sum}"
+            )
+            lines.append(
+                f"scripts_stage_seconds_count{{{labels}}} {histogram.count}"
+            )
+        lines.append("# TYPE scripts_events_total counter")
+        for event, value in self.counters.items():
+            lines.append(
+                f'scripts_events_total{{{script},event="{event}"}} {value}'
+            )
+        lines.append("# TYPE scripts_gauge gauge")
+        for name, number in self.gauges.items():
+            lines.append(f'scripts_gauge{{{script},name="{name}"}} {number}')
+        return "\n".join(lines) + "\n"
+
+    def _export(self, filepath: str) -> None:
+        """Function created to write the metrics file, in json when the
+        file ends with .json and in prometheus text format otherwise.
+        Args:
+            filepath (str): The metrics file path
+        """
+        if filepath.endswith(".json"):
+            content = self.to_json()
+        else:
+            content = self.to_prometheus()
+        temporary = f"{filepath}.tmp"
+        with open(temporary, "w") as file:
+            file.write(content)
+        os.replace(temporary, filepath)
+        logger.info(f"Metrics written in {filepath}")
+
+    def _summary(self) -> None:
+        """Function created to log the time spent in each stage"""
+        for stage, histogram in self.histograms.items():
+            mean = histogram.sum / histogram.count
+            logger.info(
+                f"{stage}: {histogram.count} calls, {histogram.sum:.3f}s "
+                f"total, {mean:.3f}s mean"
+            )
+
+    @contextmanager
+    def run(self, script: str) -> Iterator[None]:
+        """Function created to instrument a whole run of a script. The
+        metrics are exported to METRICS_FILE, when defined, and PROFILE may
+        enable cprofile or tracemalloc for the run.
+        Args:
+            script (str): The script name
+        """
+        self.reset(script)
+        profile = os.environ.get("PROFILE", "").strip().lower()
+        profiler: Optional[cProfile.Profile] = None
+        if profile == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        elif profile == "tracemalloc":
+            tracemalloc.start()
+        try:
+            with self.span("total"):
+                yield
+        finally:
+            if profiler:
+                profiler.disable()
+                profiler.dump_stats(f"{script}.prof")
+                logger.info(f"Profile written in {script}.prof")
+            elif profile == "tracemalloc":
+                self._stop_tracemalloc()
+            self._summary()
+            filepath = os.environ.get("METRICS_FILE")
+            if filepath:
+                self._export(filepath)
+
+    def _stop_tracemalloc(self) -> None:
+        """Function created to log the lines allocating more memory and
+        keep the peak of memory used in the run.
+        """
+        snapshot = tracemalloc.take_snapshot()
+        self.gauges["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        for stat in snapshot.statistics("lineno")[:10]:
+            logger.info(str(stat))
+
+
+metrics = Metrics()
@@ -0,0 +1,58 @@
+import os
+from typing import Any, Dict
+
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.sync_api import BrowserContext
+
+from . import logger
+
+
+class Snapshots:
+    """Snapshots class"""
+
+    def __init__(self, name: str) -> None:
+        self._mode = os.environ.get("REPLAY_MODE", "").strip().lower()
+        self._folder = os.environ.get("REPLAY_FOLDER", "snapshots")
+        self._name = name
+        if self._mode not in ("", "record", "replay"):
+            raise ValueError(
+                f"Unknown REPLAY_MODE {self._mode}, use record or replay."
+            )
+
+    @property
+    def har_path(self) -> str:
+        return os.path.join(self._folder, f"{self._name}.har")
+
+    def _options(self) -> Dict[str, Any]:
+        """Function created to build the routing options of the mode.
+        Recording saves every page visited in the har file, replaying
+        serves them from it and aborts anything not recorded, so no
+        request ever reaches the live website.
+        Returns:
+            Dict[str, Any]: Returns the keyword arguments of route_from_har.
+        """
+        if self._mode == "record":
+            os.makedirs(self._folder, exist_ok=True)
+            logger.info(f"Recording the pages visited in {self.har_path}")
+            return {"update": True, "update_content": "embed"}
+        logger.info(f"Replaying the pages recorded in {self.har_path}")
+        return {"not_found": "abort"}
+
+    def route(self, context: BrowserContext) -> None:
+        """Function created to record or replay the pages of a context,
+        doing nothing when REPLAY_MODE is not defined. The har file is only
+        written when the context is closed.
+        Args:
+            context (BrowserContext): Receive a browser context
+        """
+        if self._mode:
+            context.route_from_har(self.har_path, **self._options())
+
+    async def route_async(self, context: AsyncBrowserContext) -> None:
+        """Function created to record or replay the pages of an async
+        context, doing nothing when REPLAY_MODE is not defined.
+        Args:
+            context (AsyncBrowserContext): Receive an async browser context
+        """
+        if self._mode:
+            await context.route_from_har(self.har_path, **self._options())
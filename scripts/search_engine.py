@@ -1,18 +1,25 @@
+from __future__ import annotations
+
 import os
 import re
 import sys
-from typing import Any, Dict, Iterator, List
-
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from spacy import load
-from spacy.matcher import Matcher
-from spacy.tokens import Doc
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
 from tabulate import tabulate  # type: ignore
 
-from . import get_filepath, logger
+from . import LazyImport, get_filepath, logger
+from .metrics import metrics
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+    from spacy.tokens import Doc
+
+Request = LazyImport("google.auth.transport.requests", "Request")
+Credentials = LazyImport("google.oauth2.credentials", "Credentials")
+InstalledAppFlow = LazyImport("google_auth_oauthlib.flow", "InstalledAppFlow")
+build = LazyImport("googleapiclient.discovery", "build")
+load = LazyImport("spacy", "load")
+Matcher = LazyImport("spacy.matcher", "Matcher")
 
 
 class GoogleDriveAPI:
@@ -34,6 +41,15 @@ class GoogleDriveAPI:
         Returns:
             Any: Returns a session object from the connection
         """
+        with metrics.span("session"):
+            return self._build_session()
+
+    def _build_session(self) -> Any:
+        """Function created to load, refresh or request the credentials and
+        build the google drive service.
+        Returns:
+            Any: Returns a session object from the connection
+        """
         creds = None
         scopes = self.scopes[0] if len(self.scopes) == 1 else self.scopes
         if os.path.exists("token.json"):
@@ -115,13 +131,14 @@ class GoogleDriveAPI:
             drive.The number of items depends on the page_size variable.
         """
         service = self.get_session()
-        results = (
-            service.files()
-            .list(pageSize=self.page_size, fields=self.list_fields)
-            .execute()
-        )
-        items = results.get("files", [])
-        drive = self.list_files(items)
+        with metrics.span("listing"):
+            results = (
+                service.files()
+                .list(pageSize=self.page_size, fields=self.list_fields)
+                .execute()
+            )
+            items = results.get("files", [])
+            drive = self.list_files(items)
         if drive.get("data"):
             logger.info(drive.get("message"))
             logger.info(drive.get("data"))
@@ -133,7 +150,14 @@ class MetaEngine:
     """MetaEngine class"""
 
     def __init__(self) -> None:
-        self._nlp = load("en_core_web_sm")
+        self._model = "en_core_web_sm"
+        self._language: Optional[Language] = None
+
+    @property
+    def _nlp(self) -> Language:
+        if self._language is None:
+            self._language = load(self._model)
+        return self._language
 
     def _extract_texts(self, items: List[Any]) -> Iterator[Doc]:
         """Function created to extract file names and convert them into
@@ -149,7 +173,7 @@ class MetaEngine:
             for item in items:
                 name = item.get("name")
                 rows.append(self.handle_phrase(name))
-        rows = self._nlp.pipe(rows)
+        rows = metrics.iterate("nlp_pipe", self._nlp.pipe(rows))
         return rows
 
     def handle_phrase(self, phrase: str) -> str:
@@ -178,10 +202,13 @@ class MetaEngine:
         """
         matcher = Matcher(self._nlp.vocab)
         pattern = [{"TEXT": word} for word in keywords]
+        matcher.add("matching", [pattern])
         for doc in documents:
-            matcher.add("matching", [pattern])
-            found = matcher(doc)
+            with metrics.span("matching"):
+                found = matcher(doc)
+            metrics.count("documents")
             if found:
+                metrics.count("matches")
                 logger.info(f"Matches: {str(doc)}")
 
     def output(self, itens: List[Any], keywords: tuple[Any, Any]) -> None:
@@ -201,18 +228,22 @@ class BuildManager:
         Returns:
             str: Returns the result
         """
-        size = self._google_api.page_size
-        fieldlist = self._google_api.list_fields
-        session = self._google_api.get_session()
-        results = (
-            session.files().list(pageSize=size, fields=fieldlist).execute()
-        )
-        items = results.get("files", [])
-        if len(args[0]) < 2:
-            self._google_api.show_itens()
-        else:
-            args[0].pop(0)  # type: ignore
-            self._meta_engine.output(items, args[0])  # type: ignore
+        with metrics.run("search_engine"):
+            size = self._google_api.page_size
+            fieldlist = self._google_api.list_fields
+            session = self._google_api.get_session()
+            with metrics.span("listing"):
+                results = (
+                    session.files()
+                    .list(pageSize=size, fields=fieldlist)
+                    .execute()
+                )
+            items = results.get("files", [])
+            if len(args[0]) < 2:
+                self._google_api.show_itens()
+            else:
+                args[0].pop(0)  # type: ignore
+                self._meta_engine.output(items, args[0])  # type: ignore
 
 
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+import pytest
+
+from tests.snapshots import Pages, require_browser, write_har
+
+
+@pytest.fixture
+def chromium():
+    """Skip the test when chromium is not installed"""
+    require_browser("chromium")
+
+
+@pytest.fixture
+def firefox():
+    """Skip the test when firefox is not installed"""
+    require_browser("firefox")
+
+
+@pytest.fixture
+def replay(tmp_path, monkeypatch):
+    """Replay the pages written by the test, never reaching the network"""
+    monkeypatch.setenv("REPLAY_MODE", "replay")
+    monkeypatch.setenv("REPLAY_FOLDER", tmp_path.as_posix())
+
+    def build(name: str, pages: Pages) -> None:
+        write_har(tmp_path, name, pages)
+
+    return build
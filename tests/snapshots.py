@@ -0,0 +1,131 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import quote
+
+import pytest
+from playwright.sync_api import sync_playwright
+
+Pages = Dict[str, Tuple[str, str]]
+
+
+def require_browser(name: str) -> None:
+    """Skip the test when the playwright browser is not installed"""
+    with sync_playwright() as player:
+        path = getattr(player, name).executable_path
+    if not Path(path).exists():
+        pytest.skip(f"{name} is not installed, run playwright install")
+
+
+def write_har(folder: Path, name: str, pages: Pages) -> None:
+    """Write a har file serving the pages, keyed by url"""
+    entries = [
+        {
+            "request": {"method": "GET", "url": url, "headers": []},
+            "response": {
+                "status": 200,
+                "headers": [{"name": "content-type", "value": mime_type}],
+                "content": {"mimeType": mime_type, "text": body},
+            },
+        }
+        for url, (mime_type, body) in pages.items()
+    ]
+    data = {"log": {"version": "1.2", "entries": entries}}
+    (folder / f"{name}.har").write_text(json.dumps(data))
+
+
+def g2_pages(names: List[str]) -> Pages:
+    """Build the G2 seller pages of the companies"""
+    pages = {}
+    for name in names:
+        slug = name.lower().replace(" ", "-")
+        pages[f"https://www.g2.com/sellers/{slug}"] = (
+            "text/html",
+            f"""<html><body>
+            <div class="rated-item__info"><h2>{name}</h2></div>
+            <div class="show-for-xlarge"><div class="paper">
+              <div class="detail-block__text">
+                <p class="fw-semibold"><a href="https://{slug}.com">Visit website</a></p>
+              </div>
+              <div class="detail-block__text">
+                <p class="fw-semibold">Phone</p><span>+1 800 000</span>
+              </div>
+              <div class="detail-block__text">
+                <p>Year Founded</p><p>1911</p>
+              </div>
+            </div></div>
+            </body></html>""",
+        )
+    return pages
+
+
+def linkedin_pages(names: List[str], checkpoint: bool = False) -> Pages:
+    """Build the LinkedIn login, feed, search and company pages, the login
+    leading to the captcha checkpoint page when asked for"""
+    landing = "/checkpoint/challenge/" if checkpoint else "/feed/"
+    searchbar = (
+        '<input class="search-global-typeahead__input" '
+        "onkeydown=\"if (event.key === 'Enter') location.href = "
+        "'/search/results/all/?keywords=' + encodeURIComponent(this.value)\">"
+    )
+    pages = {
+        "https://www.linkedin.com/home": (
+            "text/html",
+            f"""<html><body>
+            <input id="session_key"><input id="session_password">
+            <button onclick="location.href='{landing}'">Sign in</button>
+            </body></html>""",
+        ),
+        "https://www.linkedin.com/checkpoint/challenge/": (
+            "text/html",
+            "<html><body><h1>Let's do a quick security check</h1>"
+            "</body></html>",
+        ),
+        "https://www.linkedin.com/feed/": (
+            "text/html",
+            f"<html><body>{searchbar}</body></html>",
+        ),
+    }
+    for index, name in enumerate(names):
+        slug = name.lower().replace(" ", "-")
+        company_url = f"https://www.linkedin.com/company/{slug}"
+        api_url = f"/voyager/api/organization/companies?universalName={slug}"
+        company_page = f"""<html><body>{searchbar}
+            <a class="org-page-navigation__item-anchor"
+               href="{company_url}/people/">People</a>
+            <div class="org-people__header-spacing-carousel">
+              <h2>{index * 1000:,} associated members</h2>
+            </div>
+            <script>fetch("{api_url}")</script>
+            </body></html>"""
+        keywords = quote(name, safe="")
+        pages[
+            f"https://www.linkedin.com/search/results/all/?keywords={keywords}"
+        ] = (
+            "text/html",
+            f'<html><body>{searchbar}<a href="{company_url}/">{name}</a>'
+            "</body></html>",
+        )
+        pages[f"{company_url}/"] = ("text/html", company_page)
+        pages[f"{company_url}/people/"] = ("text/html", company_page)
+        pages[f"https://www.linkedin.com{api_url}"] = (
+            "application/json",
+            json.dumps(
+                {
+                    "included": [
+                        {
+                            "name": f"{name} Partner",
+                            "staffCount": 1,
+                            "universalName": f"{slug}-partner",
+                        },
+                        {
+                            "name": name,
+                            "staffCount": index * 1000,
+                            "url": company_url,
+                        },
+                        {"$type": "com.linkedin.voyager.common.Me"},
+                    ]
+                }
+            ),
+        )
+    return pages
@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from scripts.company_details import DataHandle, Scrapper
+from tests.snapshots import g2_pages
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        (
+            "Url,\n"
+            "https://www.g2.com/sellers/ibm,\n"
+            "https://WWW.G2.com/sellers/ibm/,\n"
+            "www.g2.com/sellers/red-hat#about,\n"
+            ",\n",
+            [
+                "https://www.g2.com/sellers/ibm",
+                "https://www.g2.com/sellers/red-hat",
+            ],
+        ),
+        (
+            "\ufeffUrl,\nhttps://www.g2.com/sellers/ibm,\n",
+            ["https://www.g2.com/sellers/ibm"],
+        ),
+        ("Url,\n", []),
+    ],
+)
+@patch("scripts.company_details.get_filepath")
+def test_get_companies_urls(mocked_get_filepath, content, expected, tmp_path):
+    """Test DataHandle.get_companies_urls function"""
+    filepath = tmp_path / "g2_urls.csv"
+    filepath.write_text(content, encoding="utf-8")
+    mocked_get_filepath.return_value = filepath.as_posix()
+    testclass = DataHandle()
+    assert list(testclass.get_companies_urls()) == expected
+
+
+@patch("scripts.company_details.get_filepath")
+def test_get_companies_urls_without_column(mocked_get_filepath, tmp_path):
+    """Test DataHandle.get_companies_urls function without the Url column"""
+    filepath = tmp_path / "g2_urls.csv"
+    filepath.write_text("Link\nhttps://www.g2.com/sellers/ibm\n")
+    mocked_get_filepath.return_value = filepath.as_posix()
+    testclass = DataHandle()
+    with pytest.raises(ValueError, match="Column Url not found"):
+        list(testclass.get_companies_urls())
+
+
+def test_get_companies_details(firefox, replay):
+    """Test Scrapper.get_companies_details function offline"""
+    pages = g2_pages(["IBM", "Red Hat"])
+    replay("company_details", pages)
+    testclass = Scrapper()
+    result = testclass.get_companies_details(list(pages))
+    assert [item["Name"] for item in result] == ["IBM", "Red Hat"]
+    assert result[1] == {
+        "Name": "Red Hat",
+        "Visit website": "https://red-hat.com",
+        "Phone": "+1 800 000",
+        "Year Founded": "1911",
+    }
+
+
+def test_avoid_security_question(firefox, replay):
+    """Test Scrapper._avoid_security_question on a captcha page offline"""
+    url = "https://www.g2.com/sellers/ibm"
+    pages = {url: ("text/html", '<div id="challenge-running">Wait</div>')}
+    replay("company_details", pages)
+    testclass = Scrapper()
+    with pytest.raises(SystemExit):
+        testclass.get_companies_details([url])
+
+
+@pytest.mark.parametrize(
+    "challenges, captchas, waits",
+    [
+        ([[]], 0, 0),
+        ([["Wait"], ["Wait"], []], 1, 2),
+    ],
+)
+@patch("scripts.company_details.metrics")
+def test_avoid_security_question_wait(
+    mocked_metrics, challenges, captchas, waits
+):
+    """Test Scrapper._avoid_security_question waiting only for captchas"""
+    page = MagicMock()
+    page.locator.return_value.all_inner_texts.side_effect = challenges
+    testclass = Scrapper()
+    testclass._headless = False
+    testclass._avoid_security_question(page)
+    assert mocked_metrics.count.call_count == captchas
+    assert mocked_metrics.span.call_count == captchas
+    assert page.wait_for_timeout.call_count == waits
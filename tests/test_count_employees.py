@@ -0,0 +1,423 @@
+import asyncio
+import os
+import stat
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pandas import DataFrame, Timedelta, Timestamp, read_csv
+from playwright.async_api import Error
+
+from scripts.count_employees import DocumentReader, Scrapper
+from tests.snapshots import linkedin_pages
+
+
+@pytest.mark.parametrize(
+    "refresh_days, expected",
+    [
+        (None, ["IBM", "Microsoft", "Canonical"]),
+        ("7", ["Microsoft", "Canonical"]),
+    ],
+)
+@patch("scripts.count_employees.get_filepath")
+def test_get_companies(
+    mocked_get_filepath, refresh_days, expected, tmp_path, monkeypatch
+):
+    """Test DocumentReader.get_companies function"""
+    if refresh_days:
+        monkeypatch.setenv("REFRESH_DAYS", refresh_days)
+    now = Timestamp.now()
+    filepath = tmp_path / "companies_linkedin.csv"
+    DataFrame(
+        {
+            "Companies": ["IBM", "Microsoft", "Canonical", "IBM"],
+            "Url": ["/company/ibm/", "/company/microsoft/", None, None],
+            "Employees": ["10", "20", None, None],
+            "Updated": [
+                now.isoformat(),
+                (now - Timedelta(days=30)).isoformat(),
+                None,
+                None,
+            ],
+        }
+    ).to_csv(filepath, index=False)
+    mocked_get_filepath.return_value = filepath.as_posix()
+    testclass = DocumentReader()
+    assert list(testclass.get_companies()) == expected
+    assert testclass.get_urls() == {
+        "IBM": "/company/ibm/",
+        "Microsoft": "/company/microsoft/",
+    }
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        (
+            "https://www.linkedin.com/company/ibm/",
+            "https://www.linkedin.com/company/ibm/people/",
+        ),
+        (
+            "/company/ibm?trk=search",
+            "https://www.linkedin.com/company/ibm/people/",
+        ),
+        (
+            "https://www.linkedin.com/company/ibm/people/",
+            "https://www.linkedin.com/company/ibm/people/",
+        ),
+    ],
+)
+def test_people_url(url, expected):
+    """Test Scrapper._people_url function"""
+    testclass = Scrapper()
+    assert testclass._people_url(url) == expected
+
+
+@pytest.mark.parametrize(
+    "companies, failing",
+    [
+        (["IBM", "Microsoft", "Canonical"], "Microsoft"),
+        (["IBM"], None),
+    ],
+)
+@patch("scripts.count_employees.Scrapper._scrape_company")
+@patch("scripts.count_employees.logger")
+def test_worker(mocked_logger, mocked_scrape_company, companies, failing):
+    """Test Scrapper._worker function"""
+
+    async def scrape(page, name, url):
+        if name == failing:
+            raise Error("Timeout")
+        return {"url": f"/company/{name}", "employees": [f"{name} 10"]}
+
+    mocked_scrape_company.side_effect = scrape
+    page = AsyncMock()
+    page.goto.side_effect = Error("Navigation failed")
+    context = MagicMock()
+    context.new_page = AsyncMock(return_value=page)
+    names = iter(companies)
+    data = {}
+    testclass = Scrapper()
+    asyncio.run(testclass._worker(context, names, data, {}))
+    assert next(names, None) is None
+    for name in companies:
+        if name == failing:
+            assert data[name] == {"url": "", "employees": []}
+        else:
+            assert data[name]["employees"] == [f"{name} 10"]
+    assert mocked_logger.error.call_count == page.goto.call_count + bool(
+        failing
+    )
+    page.close.assert_awaited_once()
+
+
+@patch("scripts.count_employees.async_playwright")
+@patch("scripts.count_employees.Scrapper._linkedin_login")
+@patch("scripts.count_employees.Scrapper._worker")
+@patch("scripts.count_employees.logger")
+def test_collect(
+    mocked_logger, mocked_worker, mocked_login, mocked_async_playwright
+):
+    """Test Scrapper._collect function, keeping the results of the other
+    workers when one of them stops"""
+
+    async def worker(context, names, data, urls):
+        for name in names:
+            if name == "Microsoft":
+                raise RuntimeError("Browser closed")
+            data[name] = {"url": f"/company/{name}", "employees": ["10"]}
+
+    mocked_worker.side_effect = worker
+    player = mocked_async_playwright.return_value.__aenter__.return_value
+    browser = player.chromium.launch = AsyncMock()
+    browser.return_value.new_context = AsyncMock()
+    testclass = Scrapper()
+    testclass._workers = 2
+    data = asyncio.run(
+        testclass._collect(["IBM", "Microsoft", "Canonical"], {})
+    )
+    assert data == {
+        "IBM": {"url": "/company/IBM", "employees": ["10"]},
+        "Canonical": {"url": "/company/Canonical", "employees": ["10"]},
+    }
+    mocked_logger.error.assert_called_once()
+
+
+@pytest.mark.parametrize("companies, workers", [([], 0), (["IBM"], 1)])
+@patch("scripts.count_employees.async_playwright")
+@patch("scripts.count_employees.Scrapper._linkedin_login")
+@patch("scripts.count_employees.Scrapper._worker")
+def test_collect_workers(
+    mocked_worker,
+    mocked_login,
+    mocked_async_playwright,
+    companies,
+    workers,
+):
+    """Test Scrapper._collect function starting no more workers than
+    companies, and no session without them"""
+    player = mocked_async_playwright.return_value.__aenter__.return_value
+    player.chromium.launch = AsyncMock()
+    testclass = Scrapper()
+    testclass._workers = 2
+    assert asyncio.run(testclass._collect(iter(companies), {})) == {}
+    assert mocked_worker.call_count == workers
+    assert mocked_login.call_count == min(workers, 1)
+    assert mocked_async_playwright.call_count == min(workers, 1)
+
+
+@patch("scripts.count_employees.async_playwright")
+@patch("scripts.count_employees.Scrapper._linkedin_login")
+def test_collect_exit(mocked_login, mocked_async_playwright):
+    """Test Scrapper._collect function closing the context, which writes
+    the recorded pages, when the login exits on a captcha"""
+    mocked_login.side_effect = SystemExit(1)
+    player = mocked_async_playwright.return_value.__aenter__.return_value
+    browser = AsyncMock()
+    player.chromium.launch = AsyncMock(return_value=browser)
+    testclass = Scrapper()
+    with pytest.raises(SystemExit):
+        asyncio.run(testclass._collect(["IBM"], {}))
+    browser.new_context.return_value.close.assert_awaited_once()
+    browser.close.assert_awaited_once()
+
+
+IBM = {
+    "name": "IBM",
+    "staffCount": 312000,
+    "url": "https://www.linkedin.com/company/ibm",
+}
+DECOY = {
+    "name": "IBM Consulting",
+    "staffCount": 160000,
+    "universalName": "ibm-consulting",
+}
+
+
+@pytest.mark.parametrize(
+    "payload, expected",
+    [
+        (
+            {
+                "data": {"entityUrn": "urn:li:company:1"},
+                "included": [{"name": "IBM"}, DECOY, IBM],
+            },
+            IBM,
+        ),
+        (
+            {"elements": [DECOY, {"name": "ibm", "staffCount": 10}]},
+            {"name": "ibm", "staffCount": 10},
+        ),
+        ({"elements": [DECOY]}, None),
+        ({"included": [{"name": "IBM", "staffCount": None}]}, None),
+        ([], None),
+    ],
+)
+def test_find_company(payload, expected):
+    """Test Scrapper._find_company function"""
+    testclass = Scrapper()
+    assert testclass._find_company(payload, "IBM", "ibm") == expected
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://www.linkedin.com/company/IBM/people/", "ibm"),
+        ("/company/red-hat?trk=search", "red-hat"),
+        ("https://www.linkedin.com/in/someone/", ""),
+    ],
+)
+def test_company_slug(url, expected):
+    """Test Scrapper._company_slug function"""
+    testclass = Scrapper()
+    assert testclass._company_slug(url) == expected
+
+
+def test_capture_company():
+    """Test Scrapper._capture_company function, ignoring the company loaded
+    before the one scraped"""
+
+    def response(url, payload):
+        mocked_response = MagicMock(url=url)
+        mocked_response.headers = {"content-type": "application/json"}
+        mocked_response.json = AsyncMock(return_value=payload)
+        return mocked_response
+
+    async def capture():
+        company = asyncio.get_running_loop().create_future()
+        testclass = Scrapper()
+        for payload in [{"elements": [DECOY]}, {"included": [IBM]}]:
+            await testclass._capture_company(
+                response("https://www.linkedin.com/voyager/api/", payload),
+                company,
+                "IBM",
+                "ibm",
+            )
+        return company.result()
+
+    assert asyncio.run(capture()) == IBM
+
+
+@patch("pandas.read_csv")
+def test_update_data(mocked_read_csv, tmp_path, monkeypatch):
+    """Test DocumentReader.update_data function"""
+    mocked_read_csv.return_value = DataFrame(
+        {
+            "Companies": ["IBM", "Microsoft", "Canonical"],
+            "Url": [None, None, None],
+        }
+    )
+    data = {
+        "IBM": {
+            "url": "/company/ibm/",
+            "employees": ["312,000 associated members"],
+        },
+        "Microsoft": {"url": "", "employees": []},
+        "Canonical": {"url": "/company/canonical/", "employees": ["1200"]},
+    }
+    testclass = DocumentReader()
+    monkeypatch.chdir(tmp_path)
+    testclass.update_data(data)
+    result = read_csv(tmp_path / "companies_linkedin.csv")
+    assert result.columns.to_list() == [
+        "Companies",
+        "Url",
+        "Employees",
+        "Updated",
+    ]
+    assert result["Employees"].to_list()[0::2] == [312000, 1200]
+    assert result["Employees"].isna().to_list() == [False, True, False]
+    assert result["Url"].to_list()[0::2] == [
+        "/company/ibm/",
+        "/company/canonical/",
+    ]
+    assert result["Updated"].isna().to_list() == [False, True, False]
+    assert list(tmp_path.iterdir()) == [tmp_path / "companies_linkedin.csv"]
+
+
+@pytest.mark.parametrize("mode", [None, 0o640])
+def test_build_file(mode, tmp_path, monkeypatch):
+    """Test DocumentReader._build_file function, keeping the file mode"""
+    (tmp_path / "examples").mkdir()
+    monkeypatch.chdir(tmp_path)
+    filepath = tmp_path / "companies_linkedin.csv"
+    umask = os.umask(0o022)
+    try:
+        if mode:
+            filepath.write_text("Companies\n")
+            filepath.chmod(mode)
+        DocumentReader()._build_file(DataFrame({"Companies": ["IBM"]}))
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(filepath.stat().st_mode) == (mode or 0o644)
+    assert filepath.read_text() == "Companies\nIBM\n"
+
+
+def test_update_data_refresh(tmp_path, monkeypatch):
+    """Test DocumentReader reading back the file written by update_data"""
+    (tmp_path / "examples").mkdir()
+    example = tmp_path / "examples" / "companies_linkedin.csv"
+    example.write_text("Companies,Url\nIBM,\nMicrosoft,\n")
+    monkeypatch.chdir(tmp_path)
+    DocumentReader().update_data(
+        {"IBM": {"url": "/company/ibm/", "employees": ["312,000"]}}
+    )
+    monkeypatch.setenv("REFRESH_DAYS", "7")
+    testclass = DocumentReader()
+    assert list(testclass.get_companies()) == ["Microsoft"]
+    assert testclass.get_urls() == {"IBM": "/company/ibm/"}
+    assert example.read_text() == "Companies,Url\nIBM,\nMicrosoft,\n"
+    example.write_text("Companies,Url\nIBM,\nCanonical,/company/x/\n")
+    testclass = DocumentReader()
+    assert list(testclass.get_companies()) == ["Microsoft", "Canonical"]
+    assert testclass.get_urls() == {"IBM": "/company/ibm/"}
+    testclass.update_data(
+        {"Canonical": {"url": "/company/canonical/", "employees": ["1200"]}}
+    )
+    result = read_csv(tmp_path / "companies_linkedin.csv", dtype="string")
+    result = result.fillna("")
+    assert result["Companies"].to_list() == ["IBM", "Microsoft", "Canonical"]
+    assert result["Url"].to_list() == [
+        "/company/ibm/",
+        "",
+        "/company/canonical/",
+    ]
+    assert result["Employees"].to_list() == ["312000", "", "1200"]
+
+
+def test_update_data_padded_names(tmp_path, monkeypatch):
+    """Test DocumentReader.update_data with names padded by spaces"""
+    (tmp_path / "examples").mkdir()
+    (tmp_path / "companies_linkedin.csv").write_text(
+        'Companies,Url\n" IBM ",\nRed Hat,\n'
+    )
+    monkeypatch.chdir(tmp_path)
+    testclass = DocumentReader()
+    names = list(testclass.get_companies())
+    assert names == ["IBM", "Red Hat"]
+    testclass.update_data(
+        {
+            name: {"url": f"/company/{index}/", "employees": ["10"]}
+            for index, name in enumerate(names)
+        }
+    )
+    result = read_csv(tmp_path / "companies_linkedin.csv")
+    assert result["Companies"].to_list() == [" IBM ", "Red Hat"]
+    assert result["Url"].to_list() == ["/company/0/", "/company/1/"]
+    assert result["Employees"].to_list() == [10, 10]
+    assert result["Updated"].notna().all()
+
+
+def test_get_information(chromium, replay):
+    """Test Scrapper.get_information function offline"""
+    names = ["IBM", "Red Hat", "Canonical"]
+    replay("count_employees", linkedin_pages(names))
+    testclass = Scrapper()
+    urls = {"Canonical": "https://www.linkedin.com/company/canonical/"}
+    result = testclass.get_information(names, urls)
+    assert result == {
+        name: {
+            "url": f"https://www.linkedin.com/company/{slug}",
+            "employees": [str(index * 1000)],
+        }
+        for index, (name, slug) in enumerate(
+            [
+                ("IBM", "ibm"),
+                ("Red Hat", "red-hat"),
+                ("Canonical", "canonical"),
+            ]
+        )
+    }
+
+
+@pytest.mark.parametrize(
+    "url, headless, exits",
+    [
+        ("https://www.linkedin.com/feed/", True, False),
+        ("https://www.linkedin.com/checkpoint/challenge/", True, True),
+    ],
+)
+@patch("scripts.count_employees.logger")
+def test_linkedin_login(mocked_logger, url, headless, exits):
+    """Test Scrapper._linkedin_login function"""
+    page = MagicMock(url=url)
+    page.goto = AsyncMock()
+    page.wait_for_load_state = AsyncMock()
+    page.locator.return_value.fill = AsyncMock()
+    page.get_by_role.return_value.click = AsyncMock()
+    testclass = Scrapper()
+    testclass._headless = headless
+    if exits:
+        with pytest.raises(SystemExit):
+            asyncio.run(testclass._linkedin_login(page))
+        mocked_logger.error.assert_called_once()
+    else:
+        asyncio.run(testclass._linkedin_login(page))
+        mocked_logger.error.assert_not_called()
+
+
+def test_linkedin_checkpoint(chromium, replay):
+    """Test Scrapper.get_information on the captcha checkpoint offline"""
+    replay("count_employees", linkedin_pages(["IBM"], checkpoint=True))
+    testclass = Scrapper()
+    with pytest.raises(SystemExit):
+        testclass.get_information(["IBM"])
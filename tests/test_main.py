@@ -0,0 +1,23 @@
+from unittest.mock import patch
+
+import pytest
+
+from scripts.__main__ import main
+
+
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        (["search_engine"], (["search_engine"],)),
+        (["search_engine", "box"], (["search_engine", "box"],)),
+        (["company_details"], ()),
+        (["count_employees"], ()),
+    ],
+)
+@patch("scripts.__main__.import_module")
+def test_main(mocked_import_module, argv, expected):
+    """Test the command line main function"""
+    main(argv)
+    mocked_import_module.assert_called_once_with(f"scripts.{argv[0]}")
+    app = mocked_import_module().BuildManager()
+    app.main.assert_called_once_with(*expected)
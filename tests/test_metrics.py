@@ -0,0 +1,72 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from scripts.metrics import Metrics
+
+
+def test_span():
+    """Test Metrics.span and Metrics.count functions"""
+    testclass = Metrics()
+    with patch("scripts.metrics.perf_counter", side_effect=[1.0, 1.2]):
+        with testclass.span("extraction"):
+            pass
+    testclass.count("pages")
+    testclass.count("pages")
+    histogram = testclass.histograms["extraction"]
+    assert histogram.count == 1
+    assert histogram.sum == pytest.approx(0.2)
+    assert histogram.cumulative()[:6] == [0, 0, 0, 0, 0, 1]
+    assert testclass.counters == {"pages": 2}
+
+
+def test_iterate():
+    """Test Metrics.iterate function"""
+    testclass = Metrics()
+    items = testclass.iterate("nlp_pipe", (item for item in "abc"))
+    assert "nlp_pipe" not in testclass.histograms
+    assert list(items) == ["a", "b", "c"]
+    assert testclass.histograms["nlp_pipe"].count == 3
+
+
+@pytest.mark.parametrize(
+    "filename, profile",
+    [
+        ("metrics.json", ""),
+        ("metrics.prom", "cprofile"),
+        ("metrics.prom", "tracemalloc"),
+    ],
+)
+def test_run(filename, profile, tmp_path, monkeypatch):
+    """Test Metrics.run function"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("METRICS_FILE", filename)
+    monkeypatch.setenv("PROFILE", profile)
+    testclass = Metrics()
+    testclass.count("stale")
+    with testclass.run("count_employees"):
+        with testclass.span("csv_write"):
+            testclass.count("companies_scraped")
+    content = (tmp_path / filename).read_text()
+    if filename.endswith(".json"):
+        data = json.loads(content)
+        assert data["script"] == "count_employees"
+        assert data["counters"] == {"companies_scraped": 1}
+        assert set(data["histograms"]) == {"csv_write", "total"}
+        assert data["histograms"]["csv_write"]["buckets"]["+Inf"] == 1
+    else:
+        assert (
+            'scripts_stage_seconds_count{script="count_employees",'
+            'stage="csv_write"} 1'
+        ) in content
+        assert (
+            'scripts_events_total{script="count_employees",'
+            'event="companies_scraped"} 1'
+        ) in content
+    assert (tmp_path / "count_employees.prof").exists() == (
+        profile == "cprofile"
+    )
+    assert ("peak_memory_bytes" in testclass.gauges) == (
+        profile == "tracemalloc"
+    )
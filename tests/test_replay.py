@@ -0,0 +1,44 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from scripts.replay import Snapshots
+
+
+@pytest.mark.parametrize(
+    "mode, expected",
+    [
+        ("", None),
+        ("record", {"update": True, "update_content": "embed"}),
+        ("replay", {"not_found": "abort"}),
+    ],
+)
+def test_route(mode, expected, tmp_path, monkeypatch):
+    """Test Snapshots.route function"""
+    folder = tmp_path / "snapshots"
+    monkeypatch.setenv("REPLAY_MODE", mode)
+    monkeypatch.setenv("REPLAY_FOLDER", folder.as_posix())
+    context = MagicMock()
+    async_context = AsyncMock()
+    testclass = Snapshots("count_employees")
+    testclass.route(context)
+    asyncio.run(testclass.route_async(async_context))
+    har_path = os.path.join(folder, "count_employees.har")
+    if expected is None:
+        context.route_from_har.assert_not_called()
+        async_context.route_from_har.assert_not_called()
+    else:
+        context.route_from_har.assert_called_once_with(har_path, **expected)
+        async_context.route_from_har.assert_awaited_once_with(
+            har_path, **expected
+        )
+    assert folder.exists() == (mode == "record")
+
+
+def test_unknown_mode(monkeypatch):
+    """Test Snapshots with an unknown REPLAY_MODE"""
+    monkeypatch.setenv("REPLAY_MODE", "live")
+    with pytest.raises(ValueError):
+        Snapshots("company_details")